@@ -219,14 +219,14 @@ for a test binary to verify crashed inputs.
 #include <fcntl.h>
 #include <unistd.h>
 #include <sys/stat.h>
+#include <sys/wait.h>
+#include <signal.h>
 
-int main(int argc, char **argv) {
-    if (argc < 2) {
-        fprintf(stderr, "Usage: %s <input_file>\n", argv[0]);
-        return 1;
-    }
+// Timeout objectives land in crashes/ too, kill inputs that hang in multi-input mode
+#define INPUT_TIMEOUT_SECS 10
 
-    FILE *f = fopen(argv[1], "rb");
+static int test_file(const char *path) {
+    FILE *f = fopen(path, "rb");
     if (!f) {
         perror("Failed to open input file");
         return 1;
@@ -258,4 +258,50 @@ int main(int argc, char **argv) {
     free(data);
     return 0;
 }
+
+int main(int argc, char **argv) {
+    if (argc < 2) {
+        fprintf(stderr, "Usage: %s <input_file> [input_file...]\n", argv[0]);
+        return 1;
+    }
+
+    if (argc == 2) {
+        return test_file(argv[1]);
+    }
+
+    // Several inputs: process startup and sanitizer init are paid once,
+    // each input runs in a forked child so one crash does not stop the rest.
+    setvbuf(stdout, NULL, _IOLBF, 0);
+    int failed = 0;
+    for (int i = 1; i < argc; i++) {
+        fflush(stdout);
+        pid_t pid = fork();
+        if (pid < 0) {
+            perror("fork");
+            return 1;
+        }
+        if (pid == 0) {
+            alarm(INPUT_TIMEOUT_SECS);
+            int rc = test_file(argv[i]);
+            fflush(stdout);
+            _exit(rc);
+        }
+
+        int status;
+        waitpid(pid, &status, 0);
+        if (WIFSIGNALED(status) && WTERMSIG(status) == SIGALRM) {
+            printf("%s: timed out (%ds)\n", argv[i], INPUT_TIMEOUT_SECS);
+            failed++;
+        } else if (WIFSIGNALED(status)) {
+            printf("%s: crashed (signal %d)\n", argv[i], WTERMSIG(status));
+            failed++;
+        } else if (WEXITSTATUS(status) != 0) {
+            printf("%s: failed (exit %d)\n", argv[i], WEXITSTATUS(status));
+            failed++;
+        }
+    }
+
+    printf("%d/%d inputs failed\n", failed, argc - 1);
+    return failed ? 1 : 0;
+}
 #endif
\ No newline at end of file
@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
+import gzip
+import http.client
 import json
 import subprocess
 import time
 import os
+import selectors
 import signal
 import sys
+import urllib.parse
 import urllib.request
+import zlib
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
 
 active_processes = {}
@@ -31,23 +37,87 @@ def get_local_ip():
 def get_instance_name(inst):
     return inst.get('name', Path(inst['config']).stem)
 
-def fetch_executions(port):
-    """Fetch total executions from Prometheus metrics endpoint."""
+def fetch_executions(conn):
+    """Fetch total executions from Prometheus metrics endpoint over a kept-alive connection."""
     try:
-        url = f"http://localhost:{port}/metrics"
-        with urllib.request.urlopen(url, timeout=2) as resp:
-            for line in resp.read().decode().split('\n'):
-                if line.startswith('global_executions_total{') and 'client="global"' in line:
-                    return int(float(line.split()[-1]))
+        conn.request('GET', '/metrics', headers={'Accept-Encoding': 'gzip'})
+        resp = conn.getresponse()
+        body = gzip.GzipFile(fileobj=resp) if resp.getheader('Content-Encoding') == 'gzip' else resp
+        try:
+            # Stream line by line and stop at the first match instead of decoding the whole body
+            for line in body:
+                if line.startswith(b'global_executions_total{') and b'client="global"' in line:
+                    return int(float(line.rsplit(None, 1)[-1]))
+        finally:
+            # Discard the rest of the body so the connection can be reused next tick
+            while resp.read(65536):
+                pass
     except TimeoutError:
-        print(f"Timeout connecting to port {port}")
+        print(f"Timeout connecting to port {conn.port}")
+        conn.close()
     except ValueError as e:
-        print(f"Failed to parse metrics from port {port}: {e}")
+        print(f"Failed to parse metrics from port {conn.port}: {e}")
+    except (http.client.HTTPException, OSError, zlib.error, EOFError):
+        # Not listening yet, connection dropped or corrupt gzip body, reconnect on next poll
+        conn.close()
     return None
 
-def create_instance_config(base_path, inst, tmp_dir):
+def query_prometheus(prometheus_url, query):
+    """Run an instant PromQL query and return its values keyed by job."""
+    url = f"{prometheus_url.rstrip('/')}/api/v1/query?{urllib.parse.urlencode({'query': query})}"
+    with urllib.request.urlopen(url, timeout=2) as resp:
+        result = json.load(resp)['data']['result']
+    return {r['metric']['job']: float(r['value'][1]) for r in result}
+
+def fetch_all_executions(prometheus_url, benchmark, since):
+    """Fetch total executions of all instances with a single Prometheus query, keyed by job.
+
+    Only samples scraped at or after `since` (unix time) count, jobs whose newest
+    sample is older map to None. Returns (executions, error); error is a message
+    when the query itself failed. The monitor shows it in the status block,
+    printing here would break the redraw.
+    """
+    # Label values are PromQL string literals, escape backslashes and quotes
+    label = benchmark.replace('\\', '\\\\').replace('"', '\\"')
+    series = f'global_executions_total{{client="global",benchmark="{label}"}}'
+    # Labels repeat every round, so a killed instance's last value lingers until the next
+    # scrape. Filter on the sample timestamp in the same query to never read it as fresh.
+    fresh = f'sum by (job) ({series}) and on (job) (max by (job) (timestamp({series})) >= {since})'
+    try:
+        executions = {job: int(v) for job, v in query_prometheus(prometheus_url, fresh).items()}
+        stale = query_prometheus(prometheus_url, f'count by (job) ({series})').keys() - executions.keys()
+        executions.update(dict.fromkeys(stale))
+        return executions, None
+    except TimeoutError:
+        return None, f"timeout querying {prometheus_url}"
+    except (KeyError, ValueError) as e:
+        return None, f"bad query result from {prometheus_url}: {e}"
+    except OSError as e:
+        return None, f"failed to query {prometheus_url}: {e}"
+
+def scrape_executions(pool, instances):
+    """Scrape each instance's metrics endpoint concurrently, keyed by instance name."""
+    executions = {}
+    for inst_name, info in instances.items():
+        # A scrape that outlived the last tick still owns the connection, wait on it instead of resubmitting
+        future = info.get('scrape')
+        if future is None or future.done():
+            future = info['scrape'] = pool.submit(fetch_executions, info['conn'])
+        executions[inst_name] = future
+    for inst_name, future in executions.items():
+        try:
+            executions[inst_name] = future.result(timeout=3)
+        except FutureTimeoutError:
+            executions[inst_name] = None
+        except Exception:
+            # One broken instance must not end the whole benchmark
+            executions[inst_name] = None
+    return executions
+
+def create_instance_config(base_config, inst, tmp_dir):
     """Create config with instance overrides."""
-    config = load_json(base_path)
+    # Overrides are top-level only, so a shallow copy keeps the shared base intact
+    config = dict(base_config)
     config['cores'] = inst['cores']
     config['broker_port'] = inst['broker_port']
     config['prometheus_port'] = inst['prometheus_port']
@@ -93,6 +163,7 @@ def cmd_run(bench_path, host_override=None):
     raw_target = bench.get('target_executions')
     target = int(str(raw_target).replace("'", "").replace("_", "")) if raw_target else None
     poll_interval = bench.get('poll_interval', 5)
+    prometheus_url = bench.get('prometheus_url')
     rounds = bench.get('rounds', 1)
     pause = bench.get('pause_between_rounds', 300)
 
@@ -109,28 +180,41 @@ def cmd_run(bench_path, host_override=None):
     print(f"Fuzzer: {fuzzer_dir}")
     print(f"Target: {target:,} executions" if target else "Target: infinite")
     print(f"Rounds: {rounds}, Host: {host}")
+    if prometheus_url:
+        print(f"Executions: queried from {prometheus_url}")
 
+    pool = None
+    sel = selectors.DefaultSelector()
     try:
         # Create configs once before all rounds
         tmp_dir = os.path.join(runs_dir, "tmp_configs")
         os.makedirs(tmp_dir, exist_ok=True)
 
         instance_configs = {}
+        base_configs = {}
         for inst in bench['instances']:
             inst_name = get_instance_name(inst)
             base_cfg = os.path.join(config_dir, inst['config'])
             if not os.path.exists(base_cfg):
                 print(f"Warning: {base_cfg} not found, skipping")
                 continue
+            # Instances often share a base config, parse each file only once
+            if base_cfg not in base_configs:
+                base_configs[base_cfg] = load_json(base_cfg)
             instance_configs[inst_name] = {
-                'cfg_path': create_instance_config(base_cfg, inst, tmp_dir),
+                'cfg_path': create_instance_config(base_configs[base_cfg], inst, tmp_dir),
                 'port': inst['prometheus_port']
             }
 
+        # Scrape all instances concurrently so a tick costs max(RTT), not sum(RTT)
+        if not prometheus_url:
+            pool = ThreadPoolExecutor(max_workers=max(1, len(instance_configs)))
+
         for rnd in range(1, rounds + 1):
             print(f"\n{'='*50}\nROUND {rnd}/{rounds}\n{'='*50}")
 
             active_processes = {}
+            round_start = time.time()
 
             for inst_name, info in instance_configs.items():
                 cfg_path = info['cfg_path']
@@ -141,9 +225,17 @@ def cmd_run(bench_path, host_override=None):
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.DEVNULL,
                     cwd=fuzzer_dir,
-                    preexec_fn=os.setsid
+                    start_new_session=True
                 )
-                active_processes[inst_name] = {'proc': proc, 'port': info['port']}
+                # pidfd becomes readable when the child exits, no need to poll it
+                pidfd = os.pidfd_open(proc.pid)
+                sel.register(pidfd, selectors.EVENT_READ, inst_name)
+                active_processes[inst_name] = {
+                    'proc': proc,
+                    'port': info['port'],
+                    'pidfd': pidfd,
+                    'conn': http.client.HTTPConnection('localhost', info['port'], timeout=2)
+                }
 
             if not active_processes:
                 print("No instances started!")
@@ -152,43 +244,72 @@ def cmd_run(bench_path, host_override=None):
             num_instances = len(active_processes)
             print(f"\nMonitoring {num_instances} instances...\n")
 
+            # Instance set is fixed for the round, so sort and build prefixes once.
+            # Finished instances keep their last line so the block height stays constant.
+            order = sorted(active_processes)
+            prefix = {n: f"{n}: " for n in order}
+            lines = {n: "starting..." for n in order}
+
             for _ in range(num_instances):
                 print()
 
             while active_processes:
-                time.sleep(poll_interval)
+                # Sleeps for poll_interval, or wakes early as soon as an instance exits
+                exited = {key.data for key, _ in sel.select(timeout=poll_interval)}
+                for inst_name in exited:
+                    active_processes[inst_name]['proc'].wait()
 
                 finished = []
-                lines = []
 
-                for inst_name, info in sorted(active_processes.items()):
+                running = active_processes.keys() - exited
+                query_error = None
+                if prometheus_url:
+                    executions, query_error = fetch_all_executions(prometheus_url, name, round_start)
+                else:
+                    executions = scrape_executions(
+                        pool, {inst_name: active_processes[inst_name] for inst_name in running}
+                    )
+
+                for inst_name in order:
+                    info = active_processes.get(inst_name)
+                    if info is None:
+                        continue
                     proc = info['proc']
 
-                    if proc.poll() is not None:
-                        lines.append(f"{inst_name}: exited (code: {proc.returncode})")
+                    if inst_name not in running:
+                        lines[inst_name] = f"exited (code: {proc.returncode})"
                         finished.append(inst_name)
                         continue
 
-                    execs = fetch_executions(info['port'])
+                    execs = executions.get(inst_name) if executions else None
                     if execs is not None:
                         if target:
                             pct = (execs / target) * 100
-                            lines.append(f"{inst_name}: {execs:>12,} / {target:,} ({pct:5.1f}%)")
+                            lines[inst_name] = f"{execs:>12,} / {target:,} ({pct:5.1f}%)"
                         else:
-                            lines.append(f"{inst_name}: {execs:>12,}")
+                            lines[inst_name] = f"{execs:>12,}"
 
                         if target and execs >= target:
                             os.killpg(os.getpgid(proc.pid), signal.SIGTERM)
                             finished.append(inst_name)
+                    elif query_error:
+                        lines[inst_name] = query_error
+                    elif prometheus_url and inst_name in executions:
+                        lines[inst_name] = "waiting for this round's first scrape..."
+                    elif prometheus_url:
+                        # Query worked but has no series for this job, usually the targets file is not loaded
+                        lines[inst_name] = f'no series for job="{inst_name}" in {prometheus_url}'
                     else:
-                        lines.append(f"{inst_name}: connecting...")
+                        lines[inst_name] = "connecting..."
 
-                print(f"\033[{num_instances}A", end='')
-                for line in lines:
-                    print(f"\033[K{line}")
+                # Jump back to the top of the block and clear it in a single write
+                print(f"\033[{num_instances}F\033[J" + "\n".join(prefix[n] + lines[n] for n in order), flush=True)
 
                 for inst_name in finished:
-                    del active_processes[inst_name]
+                    info = active_processes.pop(inst_name)
+                    sel.unregister(info['pidfd'])
+                    os.close(info['pidfd'])
+                    info['conn'].close()
 
             print(f"\nRound {rnd} complete!")
 
@@ -199,7 +320,10 @@ def cmd_run(bench_path, host_override=None):
         print(f"\n{'='*50}\nBenchmark complete!\n{'='*50}")
 
     finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
         cleanup()
+        sel.close()
 
 def parse_host_arg():
     for arg in sys.argv:
@@ -222,6 +346,14 @@ def cleanup():
             print(f"Killed {name}")
         except (ProcessLookupError, OSError):
             pass
+        # Pop the pidfd so a re-entered cleanup (second Ctrl-C) never closes it twice
+        pidfd = info.pop('pidfd', None)
+        try:
+            info['conn'].close()
+            if pidfd is not None:
+                os.close(pidfd)
+        except OSError:
+            pass
     active_processes = {}
 
 def signal_handler(_, __):